@@ -5,17 +5,18 @@ Comprehensive tool for extracting channel information from YouTube subscription
 """
 
 import re
-import csv
 import html
 import argparse
 import sys
 import os
-import json
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
 from pathlib import Path
-from urllib.parse import unquote
+from contextlib import contextmanager
 import datetime
+from html.parser import HTMLParser
+
+# Writer, image and profiling dependencies (csv, json, xml, sqlite3, base64,
+# hashlib, tempfile, tracemalloc, resource) are imported inside the functions
+# that use them so a run only pays for the format and options it selects.
 
 __version__ = "1.1.0"
 __author__ = "abe238"
@@ -80,6 +81,299 @@ def extract_all_profile_images_from_mhtml(content):
     
     return unique_images
 
+IMAGE_EXTENSIONS = {
+    'image/jpeg': '.jpg',
+    'image/jpg': '.jpg',
+    'image/png': '.png',
+    'image/webp': '.webp',
+    'image/gif': '.gif',
+    'image/avif': '.avif'
+}
+
+def _finish_embedded_image(part, images_dir):
+    """Move a decoded image part to its content-addressed filename and return the path"""
+    import base64
+    
+    temp_file = part['temp_file']
+    
+    if part['leftover']:
+        # Tolerate missing padding on the final base64 chunk
+        padded = part['leftover'] + b'=' * (-len(part['leftover']) % 4)
+        try:
+            decoded = base64.b64decode(padded)
+        except ValueError:
+            temp_file.close()
+            os.remove(temp_file.name)
+            return None
+        part['hasher'].update(decoded)
+        temp_file.write(decoded)
+    temp_file.close()
+    
+    extension = IMAGE_EXTENSIONS.get(part['content_type'], '.img')
+    target = images_dir / f"{part['hasher'].hexdigest()}{extension}"
+    
+    if target.exists():
+        # Identical bytes were already stored by this or an earlier export
+        os.remove(temp_file.name)
+    else:
+        commit_temp_file(temp_file.name, target)
+    
+    return str(target)
+
+def extract_embedded_images_from_mhtml(mhtml_file_path, images_dir, verbose=False):
+    """Decode base64 profile image parts from an MHTML archive into images_dir
+    
+    The archive is streamed line by line so image bytes never have to be held
+    in memory as a whole. Each image is stored once under the SHA-256 of its
+    bytes, which deduplicates identical avatars within and across exports.
+    Returns a dict mapping Content-Location URLs to local file paths.
+    """
+    import base64
+    import hashlib
+    import tempfile
+    
+    images_dir = Path(images_dir)
+    images_dir.mkdir(parents=True, exist_ok=True)
+    
+    image_files = {}
+    delimiter = None
+    headers = None
+    last_header = None
+    part = None
+    
+    def discard_part():
+        part['temp_file'].close()
+        os.remove(part['temp_file'].name)
+    
+    with open(mhtml_file_path, 'rb') as file:
+        for line in file:
+            stripped = line.strip()
+            
+            # Find the multipart boundary from the top-level headers
+            if delimiter is None:
+                boundary_match = re.search(rb'boundary="?([^";\s]+)"?', line, re.IGNORECASE)
+                if boundary_match:
+                    delimiter = b'--' + boundary_match.group(1)
+                continue
+            
+            if stripped.startswith(delimiter):
+                if part is not None:
+                    local_path = _finish_embedded_image(part, images_dir)
+                    if local_path:
+                        image_files[part['url']] = local_path
+                    part = None
+                headers = {}
+                last_header = None
+                continue
+            
+            if headers is not None:
+                if stripped:
+                    if line[:1] in (b' ', b'\t') and last_header:
+                        headers[last_header] += ' ' + stripped.decode('latin1')
+                    elif b':' in stripped:
+                        name, value = stripped.split(b':', 1)
+                        last_header = name.strip().decode('latin1').lower()
+                        headers[last_header] = value.strip().decode('latin1')
+                    continue
+                
+                # Blank line ends the part headers
+                url = headers.get('content-location', '')
+                content_type = headers.get('content-type', '').split(';')[0].strip().lower()
+                encoding = headers.get('content-transfer-encoding', '').lower()
+                headers = None
+                
+                if ('yt3.googleusercontent.com' in url and
+                    content_type.startswith('image/') and
+                    encoding == 'base64'):
+                    part = {
+                        'url': url,
+                        'content_type': content_type,
+                        'hasher': hashlib.sha256(),
+                        'temp_file': tempfile.NamedTemporaryFile(dir=images_dir, suffix='.part', delete=False),
+                        'leftover': b''
+                    }
+                continue
+            
+            if part is not None and stripped:
+                # Decode whole 4-character groups and carry the rest to the next line
+                data = part['leftover'] + stripped
+                cut = len(data) - len(data) % 4
+                try:
+                    decoded = base64.b64decode(data[:cut])
+                except ValueError:
+                    if verbose:
+                        print(f"⚠️ Skipping malformed embedded image: {part['url']}")
+                    discard_part()
+                    part = None
+                    continue
+                part['hasher'].update(decoded)
+                part['temp_file'].write(decoded)
+                part['leftover'] = data[cut:]
+        
+        # Archive ended without a closing delimiter
+        if part is not None:
+            local_path = _finish_embedded_image(part, images_dir)
+            if local_path:
+                image_files[part['url']] = local_path
+    
+    return image_files
+
+SUBSCRIBER_HISTOGRAM_BUCKETS = [
+    ('<1K', 1000),
+    ('1K-10K', 10000),
+    ('10K-100K', 100000),
+    ('100K-1M', 1000000),
+    ('1M-10M', 10000000),
+    ('10M+', None)
+]
+
+RECORD_SIZE_BUCKETS = [
+    ('<256B', 256),
+    ('256B-1KB', 1024),
+    ('1KB-4KB', 4096),
+    ('4KB+', None)
+]
+
+SUBSCRIBER_PERCENTILES = [10, 25, 50, 75, 90, 99]
+
+def _bucket_label(value, buckets):
+    """Return the label of the first bucket whose upper bound exceeds value"""
+    for label, upper in buckets:
+        if upper is None or value < upper:
+            return label
+
+def new_channel_stats():
+    """Create an empty summary statistics accumulator"""
+    return {
+        'total_channels': 0,
+        'field_counts': {},
+        'subscriber_counts': [],
+        'subscriber_histogram': {label: 0 for label, _ in SUBSCRIBER_HISTOGRAM_BUCKETS},
+        'record_size_buckets': {label: 0 for label, _ in RECORD_SIZE_BUCKETS}
+    }
+
+def update_channel_stats(stats, channel):
+    """Add a single finished channel record to a statistics accumulator"""
+    stats['total_channels'] += 1
+    
+    record_size = 0
+    for field_name, field_value in channel.items():
+        count = stats['field_counts'].get(field_name, 0)
+        stats['field_counts'][field_name] = count + 1 if field_value else count
+        record_size += len(str(field_value).encode('utf-8'))
+    stats['record_size_buckets'][_bucket_label(record_size, RECORD_SIZE_BUCKETS)] += 1
+    
+    raw_count = channel.get('SubsCountRaw', '')
+    if raw_count and raw_count.isdigit():
+        raw_count = int(raw_count)
+        stats['subscriber_counts'].append(raw_count)
+        stats['subscriber_histogram'][_bucket_label(raw_count, SUBSCRIBER_HISTOGRAM_BUCKETS)] += 1
+
+def compute_channel_stats(channels):
+    """Build a statistics accumulator from an already extracted channel list"""
+    stats = new_channel_stats()
+    for channel in channels:
+        update_channel_stats(stats, channel)
+    return stats
+
+def summarize_channel_stats(stats):
+    """Turn a statistics accumulator into a JSON-serializable summary report"""
+    total = stats['total_channels']
+    
+    field_coverage = {}
+    for field_name, count in stats['field_counts'].items():
+        field_coverage[field_name] = {
+            'count': count,
+            'percent': round(count / total * 100, 1) if total else 0.0
+        }
+    
+    counts = sorted(stats['subscriber_counts'])
+    subscribers = {'channels_with_counts': len(counts)}
+    if counts:
+        subscribers.update({
+            'min': counts[0],
+            'max': counts[-1],
+            'mean': round(sum(counts) / len(counts), 1),
+            'total': sum(counts),
+            # Nearest-rank percentiles
+            'percentiles': {
+                f"p{p}": counts[max(0, -(-p * len(counts) // 100) - 1)]
+                for p in SUBSCRIBER_PERCENTILES
+            }
+        })
+    subscribers['histogram'] = dict(stats['subscriber_histogram'])
+    
+    return {
+        'total_channels': total,
+        'field_coverage': field_coverage,
+        'subscribers': subscribers,
+        'record_size_buckets': dict(stats['record_size_buckets'])
+    }
+
+def build_export_metadata(stats):
+    """Build the metadata block shared by the JSON, XML and SQL writers"""
+    field_counts = stats['field_counts']
+    return {
+        "export_date": datetime.datetime.now().isoformat(),
+        "extractor_version": __version__,
+        "total_channels": stats['total_channels'],
+        "channels_with_subscribers": field_counts.get('SubscriberCount', 0),
+        "channels_with_images": field_counts.get('ChannelImage', 0),
+        "channels_with_descriptions": field_counts.get('ChannelDescription', 0)
+    }
+
+def get_peak_rss():
+    """Return the peak resident set size of this process in bytes, or None if unavailable"""
+    try:
+        import resource
+    except ImportError:  # Not available on Windows
+        return None
+    
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    if sys.platform == 'darwin':
+        return peak
+    return peak * 1024
+
+def record_memory_stage(memory_report, stage):
+    """Append traced and peak memory usage for a finished processing stage"""
+    if memory_report is None:
+        return
+    
+    import tracemalloc
+    if not tracemalloc.is_tracing():
+        return
+    
+    current, peak = tracemalloc.get_traced_memory()
+    memory_report.append({
+        'stage': stage,
+        'current_bytes': current,
+        'peak_bytes': peak,
+        'peak_rss_bytes': get_peak_rss()
+    })
+    
+    # Reset the peak so each stage reports its own high-water mark (Python 3.9+)
+    if hasattr(tracemalloc, 'reset_peak'):
+        tracemalloc.reset_peak()
+
+def print_memory_report(memory_report, input_size=None):
+    """Print a per-stage breakdown of memory usage"""
+    if not memory_report:
+        return
+    
+    def to_mb(value):
+        return f"{value / (1024 * 1024):10.2f}" if value is not None else f"{'n/a':>10}"
+    
+    print(f"\n🧠 Memory report:")
+    print(f"   {'Stage':<16}{'Current MB':>12}{'Peak MB':>12}{'Peak RSS MB':>14}")
+    for entry in memory_report:
+        print(f"   {entry['stage']:<16}{to_mb(entry['current_bytes']):>12}{to_mb(entry['peak_bytes']):>12}{to_mb(entry['peak_rss_bytes']):>14}")
+    
+    overall_peak = max(entry['peak_bytes'] for entry in memory_report)
+    print(f"   Overall traced peak: {to_mb(overall_peak).strip()} MB")
+    if input_size:
+        print(f"   Peak / input size: {overall_peak / input_size:.1f}x")
+
 def clean_mhtml_encoding(text):
     """Clean MHTML encoding artifacts"""
     text = text.replace('=3D', '=')
@@ -93,8 +387,375 @@ def clean_mhtml_encoding(text):
     text = html.unescape(text)
     return text
 
-def extract_youtube_channels_comprehensive(mhtml_file_path, quality='comprehensive', verbose=False):
-    """Extract YouTube channels with comprehensive image handling"""
+def parse_channel_section_regex(section, quality='comprehensive'):
+    """Extract channel fields from a ytd-channel-renderer section using regular expressions
+    
+    Returns (channel_data, handle), or (None, None) if the section has no channel link.
+    """
+    channel_data = {
+        'ChannelName': '',
+        'ChannelLink': '',
+        'ChannelImage': '',
+        'SubscriberCount': '',
+        'SubsCountRaw': '',
+        'ChannelDescription': ''
+    }
+    
+    # Extract channel URL and handle
+    url_match = re.search(r'href="(https://www\.youtube\.com/@([^"]+))"', section)
+    if not url_match:
+        return None, None
+        
+    channel_data['ChannelLink'] = url_match.group(1)
+    handle = url_match.group(2)
+    
+    # Extract channel name
+    name_patterns = [
+        r'<yt-formatted-string[^>]*class="[^"]*ytd-channel-name[^"]*"[^>]*>([^<]+)</yt-formatted-string>',
+        r'title="([^"]*' + re.escape(handle) + r'[^"]*)"',
+        r'aria-label="([^"]*' + re.escape(handle) + r'[^"]*)"'
+    ]
+    
+    for pattern in name_patterns:
+        name_match = re.search(pattern, section, re.IGNORECASE)
+        if name_match:
+            name = name_match.group(1).strip()
+            if len(name) > 1 and 'subscriber' not in name.lower():
+                channel_data['ChannelName'] = name
+                break
+    
+    if not channel_data['ChannelName']:
+        channel_data['ChannelName'] = handle.replace('_', ' ').replace('-', ' ').title()
+    
+    # Extract subscriber count
+    sub_patterns = [
+        r'<span[^>]*id="video-count"[^>]*>([^<]*subscribers?[^<]*)</span>',
+        r'(\d+(?:\.\d+)?[KM]?)\s+subscribers?',
+        r'subscribers?[^0-9]*(\d+(?:\.\d+)?[KM]?)',
+    ]
+    
+    for pattern in sub_patterns:
+        sub_match = re.search(pattern, section, re.IGNORECASE)
+        if sub_match:
+            sub_text = sub_match.group(1)
+            num_match = re.search(r'(\d+(?:\.\d+)?[KM]?)', sub_text)
+            if num_match:
+                channel_data['SubscriberCount'] = num_match.group(1)
+                channel_data['SubsCountRaw'] = convert_subscriber_count_to_raw(num_match.group(1))
+                break
+    
+    # Extract description (skip in fast mode)
+    if quality == 'comprehensive':
+        desc_patterns = [
+            r'<yt-formatted-string[^>]*id="description"[^>]*>([^<]+(?:\s+[^<]+)*)</yt-formatted-string>',
+            r'id="description"[^>]*>([^<]*[A-Z][^<]*\.[^<]*)</[^>]*>',
+        ]
+        
+        for pattern in desc_patterns:
+            desc_match = re.search(pattern, section, re.IGNORECASE | re.DOTALL)
+            if desc_match:
+                desc = desc_match.group(1).strip()
+                desc = re.sub(r'\s+', ' ', desc)
+                desc = desc.replace('\n', ' ').replace('\r', ' ')
+                
+                if (len(desc) > 10 and 
+                    'subscriber' not in desc.lower() and 
+                    not re.match(r'^\d+[KM]?$', desc)):
+                    channel_data['ChannelDescription'] = desc[:500]
+                    break
+    
+    # Extract profile image - try multiple approaches
+    img_patterns = [
+        r'src="(https://yt3\.googleusercontent\.com/[^"]*s176[^"]*)"',
+        r'"url":"(https://yt3\.googleusercontent\.com/[^"]*s176[^"]*)"',
+    ]
+    
+    for pattern in img_patterns:
+        img_match = re.search(pattern, section)
+        if img_match:
+            img_url = img_match.group(1)
+            channel_data['ChannelImage'] = img_url
+            break
+    
+    return channel_data, handle
+
+class ChannelSectionParser(HTMLParser):
+    """Event-driven state machine that collects every channel field in one tokenizer pass"""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.link = ''
+        self.handle = ''
+        self.image = ''
+        self.name = ''
+        self.subscriber_text = ''
+        self.description = ''
+        # Text of the first non yt-formatted-string element with id="description"
+        self.fallback_description = ''
+        self.titles = []
+        self.aria_labels = []
+        self.texts = []
+        # Field currently being captured, the tag that closes it, and nesting depth
+        self.capture_field = None
+        self.capture_tag = None
+        self.capture_depth = 0
+        self.capture_parts = []
+    
+    def handle_starttag(self, tag, attrs):
+        attrs = dict((name, value or '') for name, value in attrs)
+        
+        if self.capture_field is not None:
+            if tag == self.capture_tag:
+                self.capture_depth += 1
+            return
+        
+        href = attrs.get('href', '')
+        if not self.link and href.startswith('https://www.youtube.com/@'):
+            self.link = href
+            self.handle = href[len('https://www.youtube.com/@'):]
+        
+        # Avatars may sit on <img> or on custom elements such as yt-img-shadow
+        src = attrs.get('src', '')
+        if (not self.image and
+                src.startswith('https://yt3.googleusercontent.com/') and 's176' in src):
+            self.image = src
+        
+        if attrs.get('title'):
+            self.titles.append(attrs['title'])
+        if attrs.get('aria-label'):
+            self.aria_labels.append(attrs['aria-label'])
+        
+        # Attribute values are searched for subscriber counts and inline JSON like the raw markup
+        self.texts.extend(value for value in attrs.values() if value)
+        
+        if tag == 'yt-formatted-string' and 'ytd-channel-name' in attrs.get('class', '') and not self.name:
+            self._start_capture('name', tag)
+        elif tag == 'yt-formatted-string' and attrs.get('id') == 'description' and not self.description:
+            self._start_capture('description', tag)
+        elif attrs.get('id') == 'description' and not self.fallback_description:
+            self._start_capture('fallback_description', tag)
+        elif tag == 'span' and attrs.get('id') == 'video-count' and not self.subscriber_text:
+            self._start_capture('subscriber_text', tag)
+    
+    def handle_endtag(self, tag):
+        if self.capture_field is None or tag != self.capture_tag:
+            return
+        
+        if self.capture_depth:
+            self.capture_depth -= 1
+            return
+        
+        setattr(self, self.capture_field, ''.join(self.capture_parts))
+        self.capture_field = None
+        self.capture_tag = None
+    
+    def handle_data(self, data):
+        self.texts.append(data)
+        if self.capture_field is not None:
+            self.capture_parts.append(data)
+    
+    def handle_entityref(self, name):
+        # Entities were already decoded while cleaning the archive; keep them literal
+        self.handle_data(f"&{name};")
+    
+    def handle_charref(self, name):
+        self.handle_data(f"&#{name};")
+    
+    def _start_capture(self, field, tag):
+        self.capture_field = field
+        self.capture_tag = tag
+        self.capture_depth = 0
+        self.capture_parts = []
+
+def parse_channel_section_html(section, quality='comprehensive'):
+    """Extract channel fields from a ytd-channel-renderer section with html.parser
+    
+    Returns (channel_data, handle), or (None, None) if the section has no channel link.
+    """
+    parser = ChannelSectionParser()
+    parser.feed(section)
+    parser.close()
+    
+    if not parser.link:
+        return None, None
+    
+    handle = parser.handle
+    channel_data = {
+        'ChannelName': '',
+        'ChannelLink': parser.link,
+        'ChannelImage': parser.image,
+        'SubscriberCount': '',
+        'SubsCountRaw': '',
+        'ChannelDescription': ''
+    }
+    
+    # Channel name, falling back to title and then aria-label attributes that mention the handle
+    name_candidates = [parser.name] + [
+        label for label in parser.titles + parser.aria_labels if handle.lower() in label.lower()
+    ]
+    for name in name_candidates:
+        name = name.strip()
+        if len(name) > 1 and 'subscriber' not in name.lower():
+            channel_data['ChannelName'] = name
+            break
+    
+    if not channel_data['ChannelName']:
+        channel_data['ChannelName'] = handle.replace('_', ' ').replace('-', ' ').title()
+    
+    # Subscriber count, falling back to any "N subscribers" text or attribute value in the section
+    sub_text = parser.subscriber_text if 'subscriber' in parser.subscriber_text.lower() else ''
+    if not sub_text:
+        all_text = ' '.join(parser.texts)
+        sub_match = (re.search(r'(\d+(?:\.\d+)?[KM]?)\s+subscribers?', all_text, re.IGNORECASE) or
+                     re.search(r'subscribers?[^0-9]*(\d+(?:\.\d+)?[KM]?)', all_text, re.IGNORECASE))
+        if sub_match:
+            sub_text = sub_match.group(1)
+    
+    num_match = re.search(r'(\d+(?:\.\d+)?[KM]?)', sub_text)
+    if num_match:
+        channel_data['SubscriberCount'] = num_match.group(1)
+        channel_data['SubsCountRaw'] = convert_subscriber_count_to_raw(num_match.group(1))
+    
+    # Description (skip in fast mode)
+    if quality == 'comprehensive':
+        desc_candidates = [parser.description]
+        # Other elements only count if the text looks like prose, using the
+        # same (case-insensitive) letter-then-period test as the regex engine
+        if re.search(r'[A-Z].*\.', parser.fallback_description, re.IGNORECASE | re.DOTALL):
+            desc_candidates.append(parser.fallback_description)
+        
+        for desc in desc_candidates:
+            desc = re.sub(r'\s+', ' ', desc.strip())
+            if (len(desc) > 10 and
+                'subscriber' not in desc.lower() and
+                not re.match(r'^\d+[KM]?$', desc)):
+                channel_data['ChannelDescription'] = desc[:500]
+                break
+    
+    # Profile image embedded in inline JSON
+    if not channel_data['ChannelImage']:
+        img_match = re.search(r'"url":"(https://yt3\.googleusercontent\.com/[^"]*s176[^"]*)"', ' '.join(parser.texts))
+        if img_match:
+            channel_data['ChannelImage'] = img_match.group(1)
+    
+    return channel_data, handle
+
+SECTION_PARSERS = {
+    'regex': parse_channel_section_regex,
+    'html': parse_channel_section_html
+}
+
+CHECKPOINT_VERSION = 1
+
+def checkpoint_fingerprint(mhtml_file_path, quality, engine):
+    """Identify the input and settings a checkpoint is only valid for"""
+    input_stat = os.stat(mhtml_file_path)
+    return {
+        'version': CHECKPOINT_VERSION,
+        'input_file': os.path.abspath(mhtml_file_path),
+        'input_size': input_stat.st_size,
+        'input_mtime': input_stat.st_mtime,
+        'quality': quality,
+        'engine': engine
+    }
+
+def checkpoint_partial_path(checkpoint_file):
+    """Return the path of the append-only partial output that belongs to a checkpoint"""
+    return Path(f"{checkpoint_file}.partial.ndjson")
+
+def load_checkpoint(checkpoint_file, fingerprint, verbose=False):
+    """Load a checkpoint, or return None if it is missing or belongs to another input"""
+    import json
+    
+    if not Path(checkpoint_file).exists():
+        if verbose:
+            print(f"ℹ️  No checkpoint found at {checkpoint_file}, starting from the beginning")
+        return None
+    
+    try:
+        with open(checkpoint_file, 'r', encoding='utf-8') as file:
+            checkpoint = json.load(file)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Could not read checkpoint {checkpoint_file} ({e}), starting from the beginning")
+        return None
+    
+    if any(checkpoint.get(key) != value for key, value in fingerprint.items()):
+        print(f"⚠️ Checkpoint {checkpoint_file} does not match this input file or settings, starting from the beginning")
+        return None
+    
+    # The checkpoint is only usable if every record it counts is still on disk
+    partial_path = checkpoint_partial_path(checkpoint_file)
+    partial_bytes = checkpoint.get('partial_bytes')
+    if (not isinstance(partial_bytes, int) or not partial_path.is_file() or
+            partial_path.stat().st_size < partial_bytes):
+        print(f"⚠️ Partial output {partial_path} is missing or shorter than checkpoint {checkpoint_file} expects, starting from the beginning")
+        return None
+    
+    return checkpoint
+
+def open_checkpoint_partial(checkpoint_file, checkpoint=None):
+    """Open the partial output for appending, dropping records written after the checkpoint"""
+    partial_path = checkpoint_partial_path(checkpoint_file)
+    if checkpoint is None:
+        return open(partial_path, 'wb')
+    
+    partial_file = open(partial_path, 'ab')
+    partial_file.truncate(checkpoint['partial_bytes'])
+    partial_file.seek(checkpoint['partial_bytes'])
+    return partial_file
+
+def read_checkpoint_partial(checkpoint_file):
+    """Read the channel records committed to a checkpoint's partial output"""
+    import json
+    
+    with open(checkpoint_partial_path(checkpoint_file), 'r', encoding='utf-8') as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+def save_checkpoint(checkpoint_file, fingerprint, partial_file, new_channels, offset, sections_processed, channel_count):
+    """Append new records to the partial output, then atomically record the resume position
+    
+    offset is a character offset into the cleaned document, which is rebuilt
+    deterministically from the input on resume.
+    """
+    import json
+    
+    for channel in new_channels:
+        partial_file.write((json.dumps(channel, ensure_ascii=False) + "\n").encode('utf-8'))
+    partial_file.flush()
+    os.fsync(partial_file.fileno())
+    
+    checkpoint = dict(fingerprint)
+    checkpoint.update({
+        'offset': offset,
+        'sections_processed': sections_processed,
+        'channels': channel_count,
+        'partial_bytes': partial_file.tell(),
+        'saved_at': datetime.datetime.now().isoformat()
+    })
+    with open_atomic(checkpoint_file, 'w', encoding='utf-8') as file:
+        json.dump(checkpoint, file, indent=2)
+
+def remove_checkpoint(checkpoint_file):
+    """Delete a checkpoint and its partial output once the export has been saved"""
+    for path in (Path(checkpoint_file), checkpoint_partial_path(checkpoint_file)):
+        if path.exists():
+            path.unlink()
+
+def extract_youtube_channels_comprehensive(mhtml_file_path, quality='comprehensive', verbose=False, memory_report=None, images_dir=None, stats=None, engine='regex',
+                                           checkpoint_file=None, resume=False, checkpoint_every=500):
+    """Extract YouTube channels with comprehensive image handling
+    
+    When memory_report is a list and tracemalloc is tracing, a memory
+    snapshot is appended to it after each processing stage. When images_dir
+    is given, embedded avatar images are decoded into it and each channel
+    gets a ChannelImageFile field with the local path. When stats is an
+    accumulator from new_channel_stats(), every final record is added to it.
+    engine selects the per-section field parser from SECTION_PARSERS.
+    
+    When checkpoint_file is given, progress is saved every checkpoint_every
+    sections and once more when extraction finishes; with resume, extraction
+    continues from a matching checkpoint instead of starting over.
+    """
     
     if verbose:
         print("🔍 Reading MHTML file...")
@@ -106,133 +767,97 @@ def extract_youtube_channels_comprehensive(mhtml_file_path, quality='comprehensi
         # Try with different encoding
         with open(mhtml_file_path, 'r', encoding='latin1', errors='ignore') as file:
             content = file.read()
+    record_memory_stage(memory_report, 'read')
     
     if verbose:
         print("🧹 Cleaning MHTML encoding...")
     content = clean_mhtml_encoding(content)
+    record_memory_stage(memory_report, 'clean')
     
     if verbose:
         print("🖼️  Extracting all profile images...")
     all_available_images = extract_all_profile_images_from_mhtml(content)
     if verbose:
         print(f"   Found {len(all_available_images)} profile image URLs")
+    record_memory_stage(memory_report, 'images')
     
     channels = []
     seen_handles = set()
     used_images = set()
+    start_offset = 0
+    sections_processed = 0
     
-    if verbose:
-        print("📊 Extracting channel data...")
+    checkpoint = None
+    if checkpoint_file is not None:
+        fingerprint = checkpoint_fingerprint(mhtml_file_path, quality, engine)
+        if resume:
+            checkpoint = load_checkpoint(checkpoint_file, fingerprint, verbose)
+        partial_file = open_checkpoint_partial(checkpoint_file, checkpoint)
     
-    # Extract channel sections
-    channel_pattern = r'ytd-channel-renderer[^>]*>.*?</ytd-channel-renderer>'
-    channel_sections = re.findall(channel_pattern, content, re.DOTALL)
+    if checkpoint is not None:
+        # Rebuild the dedupe state from the records committed before the checkpoint
+        channels = read_checkpoint_partial(checkpoint_file)
+        for channel in channels:
+            seen_handles.add(channel['ChannelLink'][len('https://www.youtube.com/@'):])
+            if channel['ChannelImage']:
+                used_images.add(channel['ChannelImage'])
+        start_offset = checkpoint['offset']
+        sections_processed = checkpoint['sections_processed']
+        if verbose:
+            print(f"⏩ Resuming from offset {start_offset} ({sections_processed} sections, {len(channels)} channels done)")
     
     if verbose:
-        print(f"Found {len(channel_sections)} ytd-channel-renderer sections")
+        print("📊 Extracting channel data...")
     
-    for i, section in enumerate(channel_sections):
+    # Walk channel sections one at a time instead of materializing them all
+    channel_pattern = re.compile(r'ytd-channel-renderer[^>]*>.*?</ytd-channel-renderer>', re.DOTALL)
+    parse_section = SECTION_PARSERS[engine]
+    pending_channels = []
+    offset = start_offset
+    
+    for i, section_match in enumerate(channel_pattern.finditer(content, start_offset), start=sections_processed):
+        section = section_match.group(0)
         try:
-            channel_data = {
-                'ChannelName': '',
-                'ChannelLink': '',
-                'ChannelImage': '',
-                'SubscriberCount': '',
-                'SubsCountRaw': '',
-                'ChannelDescription': ''
-            }
+            channel_data, handle = parse_section(section, quality)
             
-            # Extract channel URL and handle
-            url_match = re.search(r'href="(https://www\.youtube\.com/@([^"]+))"', section)
-            if not url_match:
-                continue
+            if channel_data is not None and handle not in seen_handles:
+                seen_handles.add(handle)
                 
-            channel_data['ChannelLink'] = url_match.group(1)
-            handle = url_match.group(2)
-            
-            if handle in seen_handles:
-                continue
-            seen_handles.add(handle)
-            
-            # Extract channel name
-            name_patterns = [
-                r'<yt-formatted-string[^>]*class="[^"]*ytd-channel-name[^"]*"[^>]*>([^<]+)</yt-formatted-string>',
-                r'title="([^"]*' + re.escape(handle) + r'[^"]*)"',
-                r'aria-label="([^"]*' + re.escape(handle) + r'[^"]*)"'
-            ]
-            
-            for pattern in name_patterns:
-                name_match = re.search(pattern, section, re.IGNORECASE)
-                if name_match:
-                    name = name_match.group(1).strip()
-                    if len(name) > 1 and 'subscriber' not in name.lower():
-                        channel_data['ChannelName'] = name
-                        break
-            
-            if not channel_data['ChannelName']:
-                channel_data['ChannelName'] = handle.replace('_', ' ').replace('-', ' ').title()
-            
-            # Extract subscriber count
-            sub_patterns = [
-                r'<span[^>]*id="video-count"[^>]*>([^<]*subscribers?[^<]*)</span>',
-                r'(\d+(?:\.\d+)?[KM]?)\s+subscribers?',
-                r'subscribers?[^0-9]*(\d+(?:\.\d+)?[KM]?)',
-            ]
-            
-            for pattern in sub_patterns:
-                sub_match = re.search(pattern, section, re.IGNORECASE)
-                if sub_match:
-                    sub_text = sub_match.group(1)
-                    num_match = re.search(r'(\d+(?:\.\d+)?[KM]?)', sub_text)
-                    if num_match:
-                        channel_data['SubscriberCount'] = num_match.group(1)
-                        channel_data['SubsCountRaw'] = convert_subscriber_count_to_raw(num_match.group(1))
-                        break
-            
-            # Extract description (skip in fast mode)
-            if quality == 'comprehensive':
-                desc_patterns = [
-                    r'<yt-formatted-string[^>]*id="description"[^>]*>([^<]+(?:\s+[^<]+)*)</yt-formatted-string>',
-                    r'id="description"[^>]*>([^<]*[A-Z][^<]*\.[^<]*)</[^>]*>',
-                ]
+                if channel_data['ChannelImage']:
+                    used_images.add(channel_data['ChannelImage'])
                 
-                for pattern in desc_patterns:
-                    desc_match = re.search(pattern, section, re.IGNORECASE | re.DOTALL)
-                    if desc_match:
-                        desc = desc_match.group(1).strip()
-                        desc = re.sub(r'\s+', ' ', desc)
-                        desc = desc.replace('\n', ' ').replace('\r', ' ')
-                        
-                        if (len(desc) > 10 and 
-                            'subscriber' not in desc.lower() and 
-                            not re.match(r'^\d+[KM]?$', desc)):
-                            channel_data['ChannelDescription'] = desc[:500]
-                            break
-            
-            # Extract profile image - try multiple approaches
-            img_patterns = [
-                r'src="(https://yt3\.googleusercontent\.com/[^"]*s176[^"]*)"',
-                r'"url":"(https://yt3\.googleusercontent\.com/[^"]*s176[^"]*)"',
-            ]
-            
-            for pattern in img_patterns:
-                img_match = re.search(pattern, section)
-                if img_match:
-                    img_url = img_match.group(1)
-                    channel_data['ChannelImage'] = img_url
-                    used_images.add(img_url)
-                    break
-            
-            channels.append(channel_data)
-            
-            # Show progress for first few channels
-            if verbose and len(channels) <= 10 and (channel_data['SubscriberCount'] or channel_data['ChannelDescription']):
-                print(f"✅ Found: {channel_data['ChannelName']} - {channel_data['SubscriberCount']} - Image: {'Yes' if channel_data['ChannelImage'] else 'No'}")
+                channels.append(channel_data)
+                pending_channels.append(channel_data)
+                
+                # Show progress for first few channels
+                if verbose and len(channels) <= 10 and (channel_data['SubscriberCount'] or channel_data['ChannelDescription']):
+                    print(f"✅ Found: {channel_data['ChannelName']} - {channel_data['SubscriberCount']} - Image: {'Yes' if channel_data['ChannelImage'] else 'No'}")
                 
         except Exception as e:
             if verbose:
                 print(f"⚠️ Error processing section {i}: {e}")
-            continue
+        
+        # Only reached once the section is fully handled; an interrupt while
+        # parsing leaves the offset on the previous section
+        offset = section_match.end()
+        sections_processed = i + 1
+        if checkpoint_file is not None and sections_processed % checkpoint_every == 0:
+            save_checkpoint(checkpoint_file, fingerprint, partial_file, pending_channels,
+                            offset, sections_processed, len(channels))
+            pending_channels = []
+    
+    if checkpoint_file is not None:
+        # Final checkpoint so a failure while saving outputs can skip extraction entirely
+        save_checkpoint(checkpoint_file, fingerprint, partial_file, pending_channels,
+                        offset, sections_processed, len(channels))
+        partial_file.close()
+    
+    if verbose:
+        print(f"Processed {sections_processed} ytd-channel-renderer sections")
+    
+    # The full document is no longer needed once every section is parsed
+    del content
+    record_memory_stage(memory_report, 'channels')
     
     # Assign remaining images to channels without images (comprehensive mode only)
     if quality == 'comprehensive':
@@ -251,29 +876,91 @@ def extract_youtube_channels_comprehensive(mhtml_file_path, quality='comprehensi
                 if verbose and assigned_count <= 10:
                     print(f"   📷 Assigned image to: {channel['ChannelName']}")
     
-    # Remove duplicates and sort
+    image_files = None
+    if images_dir is not None:
+        if verbose:
+            print(f"🖼️  Extracting embedded images to {images_dir}...")
+        image_files = extract_embedded_images_from_mhtml(mhtml_file_path, images_dir, verbose)
+        if verbose:
+            print(f"   Stored {len(set(image_files.values()))} unique images")
+        record_memory_stage(memory_report, 'embedded_images')
+    
+    # Remove duplicates, finalize records and sort
     unique_channels = []
     seen_urls = set()
     
     for channel in channels:
         if channel['ChannelLink'] not in seen_urls:
             seen_urls.add(channel['ChannelLink'])
+            if image_files is not None:
+                channel['ChannelImageFile'] = image_files.get(channel['ChannelImage'], '')
+            if stats is not None:
+                update_channel_stats(stats, channel)
             unique_channels.append(channel)
     
     unique_channels.sort(key=lambda x: x['ChannelName'].lower())
+    record_memory_stage(memory_report, 'dedupe_sort')
     
     return unique_channels
 
-def save_channels_to_csv(channels, output_file, verbose=False):
+def _read_umask():
+    """Return the process umask (os.umask can only be read by setting it)"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+# Read once at import, before any worker threads exist, so committing files
+# from background threads never has to touch the process-wide umask
+_UMASK = _read_umask()
+
+def commit_temp_file(temp_name, output_file):
+    """Give a finished temporary file default permissions and rename it over output_file"""
+    # mkstemp creates owner-only files; match the permissions open() would give
+    os.chmod(temp_name, 0o666 & ~_UMASK)
+    os.replace(temp_name, str(output_file))
+
+@contextmanager
+def atomic_path(output_file):
+    """Yield a temporary path next to output_file and rename it into place on success"""
+    import tempfile
+    
+    output_path = Path(output_file)
+    fd, temp_name = tempfile.mkstemp(dir=str(output_path.parent), prefix=f".{output_path.name}.", suffix='.tmp')
+    os.close(fd)
+    try:
+        yield temp_name
+        commit_temp_file(temp_name, output_path)
+    except BaseException:
+        if os.path.exists(temp_name):
+            os.remove(temp_name)
+        raise
+
+@contextmanager
+def open_atomic(output_file, mode='w', **kwargs):
+    """Open a file for writing that only replaces output_file once fully written"""
+    with atomic_path(output_file) as temp_name:
+        with open(temp_name, mode, **kwargs) as file:
+            yield file
+
+def csv_fieldnames(channels):
+    """Return the CSV column order for a list of channels"""
+    fieldnames = ['ChannelName', 'ChannelLink', 'ChannelImage', 'SubscriberCount', 'SubsCountRaw', 'ChannelDescription']
+    if 'ChannelImageFile' in channels[0]:
+        fieldnames.append('ChannelImageFile')
+    return fieldnames
+
+def save_channels_to_csv(channels, output_file, verbose=False, stats=None):
     """Save channels to CSV file"""
+    import csv
+    
     if not channels:
         print("❌ No channels found to save.")
         return False
     
-    fieldnames = ['ChannelName', 'ChannelLink', 'ChannelImage', 'SubscriberCount', 'SubsCountRaw', 'ChannelDescription']
+    fieldnames = csv_fieldnames(channels)
     
     try:
-        with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
+        with open_atomic(output_file, 'w', newline='', encoding='utf-8') as csvfile:
             writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
             writer.writeheader()
             writer.writerows(channels)
@@ -286,27 +973,25 @@ def save_channels_to_csv(channels, output_file, verbose=False):
         print(f"❌ Error saving CSV file: {e}")
         return False
 
-def save_channels_to_json(channels, output_file, verbose=False):
+def save_channels_to_json(channels, output_file, verbose=False, stats=None):
     """Save channels to JSON file"""
+    import json
+    
     if not channels:
         print("❌ No channels found to save.")
         return False
     
     try:
+        if stats is None:
+            stats = compute_channel_stats(channels)
+        
         # Create metadata for the export
         export_data = {
-            "metadata": {
-                "export_date": datetime.datetime.now().isoformat(),
-                "extractor_version": __version__,
-                "total_channels": len(channels),
-                "channels_with_subscribers": sum(1 for ch in channels if ch['SubscriberCount']),
-                "channels_with_images": sum(1 for ch in channels if ch['ChannelImage']),
-                "channels_with_descriptions": sum(1 for ch in channels if ch['ChannelDescription'])
-            },
+            "metadata": build_export_metadata(stats),
             "channels": channels
         }
         
-        with open(output_file, 'w', encoding='utf-8') as jsonfile:
+        with open_atomic(output_file, 'w', encoding='utf-8') as jsonfile:
             json.dump(export_data, jsonfile, indent=2, ensure_ascii=False)
         
         if verbose:
@@ -317,8 +1002,32 @@ def save_channels_to_json(channels, output_file, verbose=False):
         print(f"❌ Error saving JSON file: {e}")
         return False
 
-def save_channels_to_xml(channels, output_file, verbose=False):
+def save_channels_to_ndjson(channels, output_file, verbose=False, stats=None):
+    """Save channels to newline-delimited JSON file, one channel object per line"""
+    import json
+    
+    if not channels:
+        print("❌ No channels found to save.")
+        return False
+    
+    try:
+        with open_atomic(output_file, 'w', encoding='utf-8') as ndjsonfile:
+            for channel in channels:
+                ndjsonfile.write(json.dumps(channel, ensure_ascii=False) + "\n")
+        
+        if verbose:
+            print(f"💾 Saved {len(channels)} channels to {output_file}")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error saving NDJSON file: {e}")
+        return False
+
+def save_channels_to_xml(channels, output_file, verbose=False, stats=None):
     """Save channels to XML file"""
+    import xml.etree.ElementTree as ET
+    from xml.dom import minidom
+    
     if not channels:
         print("❌ No channels found to save.")
         return False
@@ -327,14 +1036,13 @@ def save_channels_to_xml(channels, output_file, verbose=False):
         # Create root element
         root = ET.Element("youtube_channels")
         
+        if stats is None:
+            stats = compute_channel_stats(channels)
+        
         # Add metadata
         metadata = ET.SubElement(root, "metadata")
-        ET.SubElement(metadata, "export_date").text = datetime.datetime.now().isoformat()
-        ET.SubElement(metadata, "extractor_version").text = __version__
-        ET.SubElement(metadata, "total_channels").text = str(len(channels))
-        ET.SubElement(metadata, "channels_with_subscribers").text = str(sum(1 for ch in channels if ch['SubscriberCount']))
-        ET.SubElement(metadata, "channels_with_images").text = str(sum(1 for ch in channels if ch['ChannelImage']))
-        ET.SubElement(metadata, "channels_with_descriptions").text = str(sum(1 for ch in channels if ch['ChannelDescription']))
+        for key, value in build_export_metadata(stats).items():
+            ET.SubElement(metadata, key).text = str(value)
         
         # Add channels
         channels_element = ET.SubElement(root, "channels")
@@ -355,7 +1063,7 @@ def save_channels_to_xml(channels, output_file, verbose=False):
         # Remove empty lines
         pretty_xml = '\n'.join([line for line in pretty_xml.split('\n') if line.strip()])
         
-        with open(output_file, 'w', encoding='utf-8') as xmlfile:
+        with open_atomic(output_file, 'w', encoding='utf-8') as xmlfile:
             xmlfile.write(pretty_xml)
         
         if verbose:
@@ -366,56 +1074,83 @@ def save_channels_to_xml(channels, output_file, verbose=False):
         print(f"❌ Error saving XML file: {e}")
         return False
 
-def save_channels_to_sql(channels, output_file, verbose=False):
+def sql_header(metadata, include_image_file=False, clear_existing=True):
+    """Return the SQL export header, table definition and optional DELETE statement"""
+    lines = [
+        "-- YouTube Channels Export\n",
+        f"-- Generated on: {metadata['export_date']}\n",
+        f"-- Extractor version: {metadata['extractor_version']}\n",
+        f"-- Total channels: {metadata['total_channels']}\n",
+        f"-- Channels with subscribers: {metadata['channels_with_subscribers']}\n",
+        f"-- Channels with images: {metadata['channels_with_images']}\n",
+        f"-- Channels with descriptions: {metadata['channels_with_descriptions']}\n\n",
+        
+        # Create table
+        "-- Create table for YouTube channels\n",
+        "CREATE TABLE IF NOT EXISTS youtube_channels (\n",
+        "    id INTEGER PRIMARY KEY AUTOINCREMENT,\n",
+        "    channel_name VARCHAR(255) NOT NULL,\n",
+        "    channel_link VARCHAR(500) NOT NULL UNIQUE,\n",
+        "    channel_image VARCHAR(500),\n",
+        "    subscriber_count VARCHAR(20),\n",
+        "    subscriber_count_raw INTEGER,\n",
+        "    channel_description TEXT,\n"
+    ]
+    if include_image_file:
+        lines.append("    channel_image_file VARCHAR(500),\n")
+    lines.append("    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP\n")
+    lines.append(");\n\n")
+    
+    # Clear existing data
+    if clear_existing:
+        lines.append("-- Clear existing data\n")
+        lines.append("DELETE FROM youtube_channels;\n\n")
+    
+    lines.append("-- Insert channel data\n")
+    return ''.join(lines)
+
+def sql_insert_statement(channel, include_image_file=False):
+    """Return the INSERT statement for a single channel"""
+    # Escape single quotes in strings
+    name = channel['ChannelName'].replace("'", "''")
+    link = channel['ChannelLink'].replace("'", "''")
+    image = channel['ChannelImage'].replace("'", "''") if channel['ChannelImage'] else ''
+    sub_count = channel['SubscriberCount'].replace("'", "''") if channel['SubscriberCount'] else ''
+    sub_raw = channel['SubsCountRaw'] if channel['SubsCountRaw'] and channel['SubsCountRaw'].isdigit() else 'NULL'
+    description = channel['ChannelDescription'].replace("'", "''") if channel['ChannelDescription'] else ''
+    
+    if include_image_file:
+        image_file = channel['ChannelImageFile'].replace("'", "''")
+        return (f"INSERT INTO youtube_channels (channel_name, channel_link, channel_image, subscriber_count, subscriber_count_raw, channel_description, channel_image_file) VALUES\n"
+                f"  ('{name}', '{link}', '{image}', '{sub_count}', {sub_raw}, '{description}', '{image_file}');\n")
+    return (f"INSERT INTO youtube_channels (channel_name, channel_link, channel_image, subscriber_count, subscriber_count_raw, channel_description) VALUES\n"
+            f"  ('{name}', '{link}', '{image}', '{sub_count}', {sub_raw}, '{description}');\n")
+
+def sql_footer():
+    """Return the SQL export footer with index creation"""
+    return ("\n-- Create indexes for better performance\n"
+            "CREATE INDEX IF NOT EXISTS idx_channel_name ON youtube_channels(channel_name);\n"
+            "CREATE INDEX IF NOT EXISTS idx_subscriber_count_raw ON youtube_channels(subscriber_count_raw);\n"
+            "\n-- End of export\n")
+
+def save_channels_to_sql(channels, output_file, verbose=False, stats=None):
     """Save channels to SQL file"""
     if not channels:
         print("❌ No channels found to save.")
         return False
     
+    include_image_file = 'ChannelImageFile' in channels[0]
+    
+    if stats is None:
+        stats = compute_channel_stats(channels)
+    metadata = build_export_metadata(stats)
+    
     try:
-        with open(output_file, 'w', encoding='utf-8') as sqlfile:
-            # Write SQL header
-            sqlfile.write("-- YouTube Channels Export\n")
-            sqlfile.write(f"-- Generated on: {datetime.datetime.now().isoformat()}\n")
-            sqlfile.write(f"-- Extractor version: {__version__}\n")
-            sqlfile.write(f"-- Total channels: {len(channels)}\n\n")
-            
-            # Create table
-            sqlfile.write("-- Create table for YouTube channels\n")
-            sqlfile.write("CREATE TABLE IF NOT EXISTS youtube_channels (\n")
-            sqlfile.write("    id INTEGER PRIMARY KEY AUTOINCREMENT,\n")
-            sqlfile.write("    channel_name VARCHAR(255) NOT NULL,\n")
-            sqlfile.write("    channel_link VARCHAR(500) NOT NULL UNIQUE,\n")
-            sqlfile.write("    channel_image VARCHAR(500),\n")
-            sqlfile.write("    subscriber_count VARCHAR(20),\n")
-            sqlfile.write("    subscriber_count_raw INTEGER,\n")
-            sqlfile.write("    channel_description TEXT,\n")
-            sqlfile.write("    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP\n")
-            sqlfile.write(");\n\n")
-            
-            # Clear existing data
-            sqlfile.write("-- Clear existing data\n")
-            sqlfile.write("DELETE FROM youtube_channels;\n\n")
-            
-            # Insert data
-            sqlfile.write("-- Insert channel data\n")
-            
+        with open_atomic(output_file, 'w', encoding='utf-8') as sqlfile:
+            sqlfile.write(sql_header(metadata, include_image_file))
             for channel in channels:
-                # Escape single quotes in strings
-                name = channel['ChannelName'].replace("'", "''")
-                link = channel['ChannelLink'].replace("'", "''")
-                image = channel['ChannelImage'].replace("'", "''") if channel['ChannelImage'] else ''
-                sub_count = channel['SubscriberCount'].replace("'", "''") if channel['SubscriberCount'] else ''
-                sub_raw = channel['SubsCountRaw'] if channel['SubsCountRaw'] and channel['SubsCountRaw'].isdigit() else 'NULL'
-                description = channel['ChannelDescription'].replace("'", "''") if channel['ChannelDescription'] else ''
-                
-                sqlfile.write(f"INSERT INTO youtube_channels (channel_name, channel_link, channel_image, subscriber_count, subscriber_count_raw, channel_description) VALUES\n")
-                sqlfile.write(f"  ('{name}', '{link}', '{image}', '{sub_count}', {sub_raw}, '{description}');\n")
-            
-            sqlfile.write("\n-- Create indexes for better performance\n")
-            sqlfile.write("CREATE INDEX IF NOT EXISTS idx_channel_name ON youtube_channels(channel_name);\n")
-            sqlfile.write("CREATE INDEX IF NOT EXISTS idx_subscriber_count_raw ON youtube_channels(subscriber_count_raw);\n")
-            sqlfile.write("\n-- End of export\n")
+                sqlfile.write(sql_insert_statement(channel, include_image_file))
+            sqlfile.write(sql_footer())
         
         if verbose:
             print(f"💾 Saved {len(channels)} channels to {output_file}")
@@ -425,35 +1160,347 @@ def save_channels_to_sql(channels, output_file, verbose=False):
         print(f"❌ Error saving SQL file: {e}")
         return False
 
+def save_channels_to_sqlite(channels, output_file, verbose=False, stats=None):
+    """Save channels to a SQLite database file"""
+    import sqlite3
+    
+    if not channels:
+        print("❌ No channels found to save.")
+        return False
+    
+    include_image_file = 'ChannelImageFile' in channels[0]
+    
+    if stats is None:
+        stats = compute_channel_stats(channels)
+    metadata = build_export_metadata(stats)
+    
+    columns = ['channel_name', 'channel_link', 'channel_image', 'subscriber_count',
+               'subscriber_count_raw', 'channel_description']
+    if include_image_file:
+        columns.append('channel_image_file')
+    
+    def channel_rows():
+        for channel in channels:
+            sub_raw = channel['SubsCountRaw']
+            row = [
+                channel['ChannelName'],
+                channel['ChannelLink'],
+                channel['ChannelImage'],
+                channel['SubscriberCount'],
+                int(sub_raw) if sub_raw and sub_raw.isdigit() else None,
+                channel['ChannelDescription']
+            ]
+            if include_image_file:
+                row.append(channel['ChannelImageFile'])
+            yield row
+    
+    try:
+        with atomic_path(output_file) as temp_name:
+            connection = sqlite3.connect(temp_name)
+            try:
+                connection.execute("""
+                    CREATE TABLE youtube_channels (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        channel_name VARCHAR(255) NOT NULL,
+                        channel_link VARCHAR(500) NOT NULL UNIQUE,
+                        channel_image VARCHAR(500),
+                        subscriber_count VARCHAR(20),
+                        subscriber_count_raw INTEGER,
+                        channel_description TEXT,
+                        {}created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """.format("channel_image_file VARCHAR(500),\n                        " if include_image_file else ""))
+                connection.execute("CREATE TABLE export_metadata (key TEXT PRIMARY KEY, value TEXT)")
+                
+                connection.executemany(
+                    f"INSERT INTO youtube_channels ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                    channel_rows()
+                )
+                connection.executemany(
+                    "INSERT INTO export_metadata (key, value) VALUES (?, ?)",
+                    [(key, str(value)) for key, value in metadata.items()]
+                )
+                
+                connection.execute("CREATE INDEX idx_channel_name ON youtube_channels(channel_name)")
+                connection.execute("CREATE INDEX idx_subscriber_count_raw ON youtube_channels(subscriber_count_raw)")
+                connection.commit()
+            finally:
+                connection.close()
+        
+        if verbose:
+            print(f"💾 Saved {len(channels)} channels to {output_file}")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error saving SQLite file: {e}")
+        return False
+
+SAVE_FUNCTIONS = {
+    'csv': save_channels_to_csv,
+    'json': save_channels_to_json,
+    'ndjson': save_channels_to_ndjson,
+    'xml': save_channels_to_xml,
+    'sql': save_channels_to_sql,
+    'sqlite': save_channels_to_sqlite
+}
+
+SHARDABLE_FORMATS = ['csv', 'ndjson', 'sql']
+
+def parse_size(value):
+    """Parse a byte size such as 500000, 512K, 64MB or 1GiB (binary multiples)"""
+    match = re.match(r'^\s*(\d+(?:\.\d+)?)\s*([KMG]?)(?:i?B)?\s*$', value, re.IGNORECASE)
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid size: {value!r}")
+    
+    multiplier = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}[match.group(2).upper()]
+    size = int(float(match.group(1)) * multiplier)
+    if size <= 0:
+        raise argparse.ArgumentTypeError(f"size must be positive: {value!r}")
+    return size
+
+def shard_file_path(output_file, index):
+    """Return the numbered part file path for a shard, e.g. channels.part0001.csv"""
+    output_path = Path(output_file)
+    return output_path.with_name(f"{output_path.stem}.part{index:04d}{output_path.suffix}")
+
+def shard_manifest_path(output_file):
+    """Return the manifest path for a sharded export, e.g. channels.csv.manifest.json"""
+    output_path = Path(output_file)
+    return output_path.with_name(f"{output_path.name}.manifest.json")
+
+def remove_stale_shards(output_file, current_files):
+    """Delete part files of output_file from earlier exports that the new manifest does not list"""
+    output_path = Path(output_file)
+    part_pattern = re.compile(re.escape(output_path.stem) + r'\.part\d{4}' + re.escape(output_path.suffix) + r'(\.gz)?')
+    
+    removed = []
+    for path in output_path.parent.iterdir():
+        if part_pattern.fullmatch(path.name) and path.name not in current_files:
+            path.unlink()
+            removed.append(path)
+    return removed
+
+def _shard_formatters(output_format, channels, metadata):
+    """Return (header, record, footer) text functions for a shardable format"""
+    include_image_file = 'ChannelImageFile' in channels[0]
+    
+    if output_format == 'csv':
+        import csv
+        import io
+        
+        fieldnames = csv_fieldnames(channels)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        
+        def csv_row(values):
+            writer.writerow(values)
+            text = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return text
+        
+        return (lambda index: csv_row(fieldnames),
+                lambda channel: csv_row([channel.get(field, '') for field in fieldnames]),
+                lambda: '')
+    
+    if output_format == 'ndjson':
+        import json
+        
+        return (lambda index: '',
+                lambda channel: json.dumps(channel, ensure_ascii=False) + "\n",
+                lambda: '')
+    
+    # Only the first SQL shard clears the table so shards can be loaded in sequence
+    return (lambda index: sql_header(metadata, include_image_file, clear_existing=(index == 1)),
+            lambda channel: sql_insert_statement(channel, include_image_file),
+            sql_footer)
+
+def _file_sha256(path):
+    """Return the SHA-256 hex digest of a file"""
+    import hashlib
+    
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+def _compress_shard(shard_path):
+    """Gzip a finished shard, remove the original and return the compressed path"""
+    import gzip
+    import shutil
+    
+    gz_path = Path(f"{shard_path}.gz")
+    with atomic_path(gz_path) as temp_name:
+        with open(shard_path, 'rb') as source, gzip.open(temp_name, 'wb') as target:
+            shutil.copyfileobj(source, target)
+    os.remove(shard_path)
+    return gz_path
+
+def save_channels_sharded(channels, output_file, output_format=None, shard_rows=None, shard_bytes=None,
+                          compress=False, verbose=False, stats=None):
+    """Save channels as numbered part files that roll over by row count and/or size
+    
+    Each shard is written to a temporary file and renamed into place when it
+    is full. With compress, finished shards are gzipped on a background thread
+    while later shards are still being written. A manifest listing every
+    shard's file name, row count, size and SHA-256 is written last.
+    """
+    import hashlib
+    import json
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor
+    
+    if output_format is None:
+        output_format = get_output_format_from_extension(output_file)
+    
+    if output_format not in SHARDABLE_FORMATS:
+        print(f"❌ Sharding is not supported for format: {output_format}")
+        print(f"Shardable formats: {', '.join(SHARDABLE_FORMATS)}")
+        return False
+    
+    if not channels:
+        print("❌ No channels found to save.")
+        return False
+    
+    if stats is None:
+        stats = compute_channel_stats(channels)
+    metadata = build_export_metadata(stats)
+    
+    header, record, footer = _shard_formatters(output_format, channels, metadata)
+    footer_bytes = footer().encode('utf-8')
+    
+    shards = []
+    compressions = []
+    current = None
+    executor = ThreadPoolExecutor(max_workers=1) if compress else None
+    
+    def write_to_shard(data):
+        current['file'].write(data)
+        current['hasher'].update(data)
+        current['bytes'] += len(data)
+    
+    def start_shard():
+        index = len(shards) + 1
+        path = shard_file_path(output_file, index)
+        fd, temp_name = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix='.tmp')
+        shard = {
+            'path': path,
+            'temp_name': temp_name,
+            'file': os.fdopen(fd, 'wb'),
+            'hasher': hashlib.sha256(),
+            'rows': 0,
+            'bytes': 0
+        }
+        shards.append(shard)
+        return shard
+    
+    def finish_shard():
+        write_to_shard(footer_bytes)
+        current['file'].close()
+        commit_temp_file(current['temp_name'], current['path'])
+        if executor is not None:
+            compressions.append((current, executor.submit(_compress_shard, current['path'])))
+        if verbose:
+            print(f"   📦 Wrote {current['path']} ({current['rows']} rows, {current['bytes']} bytes)")
+    
+    try:
+        for channel in channels:
+            data = record(channel).encode('utf-8')
+            
+            if current is not None and current['rows'] and (
+                    (shard_rows and current['rows'] >= shard_rows) or
+                    (shard_bytes and current['bytes'] + len(data) + len(footer_bytes) > shard_bytes)):
+                finish_shard()
+                current = None
+            
+            if current is None:
+                current = start_shard()
+                write_to_shard(header(len(shards)).encode('utf-8'))
+            
+            write_to_shard(data)
+            current['rows'] += 1
+        
+        finish_shard()
+        current = None
+        
+        manifest_shards = []
+        for shard in shards:
+            manifest_shards.append({
+                'file': shard['path'].name,
+                'rows': shard['rows'],
+                'bytes': shard['bytes'],
+                'sha256': shard['hasher'].hexdigest()
+            })
+        
+        for shard, future in compressions:
+            gz_path = future.result()
+            entry = manifest_shards[shards.index(shard)]
+            entry['uncompressed_bytes'] = entry['bytes']
+            entry['uncompressed_sha256'] = entry['sha256']
+            entry['file'] = gz_path.name
+            entry['bytes'] = gz_path.stat().st_size
+            entry['sha256'] = _file_sha256(gz_path)
+        
+        manifest = {
+            'export_date': metadata['export_date'],
+            'extractor_version': metadata['extractor_version'],
+            'format': output_format,
+            'compression': 'gzip' if compress else None,
+            'total_rows': sum(shard['rows'] for shard in shards),
+            'shards': manifest_shards
+        }
+        manifest_path = shard_manifest_path(output_file)
+        with open_atomic(manifest_path, 'w', encoding='utf-8') as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+        
+        removed = remove_stale_shards(output_file, [entry['file'] for entry in manifest_shards])
+        if verbose and removed:
+            print(f"   🧹 Removed {len(removed)} part files left over from a previous export")
+        
+        if verbose:
+            print(f"💾 Saved {len(channels)} channels to {len(shards)} shards, manifest: {manifest_path}")
+        return True
+        
+    except Exception as e:
+        if current is not None:
+            current['file'].close()
+            if os.path.exists(current['temp_name']):
+                os.remove(current['temp_name'])
+        print(f"❌ Error saving sharded {output_format.upper()} output: {e}")
+        return False
+    
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+
 def get_output_format_from_extension(filename):
     """Determine output format from file extension"""
     ext = Path(filename).suffix.lower()
     format_map = {
         '.csv': 'csv',
         '.json': 'json',
+        '.ndjson': 'ndjson',
+        '.jsonl': 'ndjson',
         '.xml': 'xml',
-        '.sql': 'sql'
+        '.sql': 'sql',
+        '.sqlite': 'sqlite',
+        '.sqlite3': 'sqlite',
+        '.db': 'sqlite'
     }
     return format_map.get(ext, 'csv')  # Default to CSV
 
-def save_channels(channels, output_file, output_format=None, verbose=False):
+def save_channels(channels, output_file, output_format=None, verbose=False, stats=None):
     """Save channels in the specified format"""
     if output_format is None:
         output_format = get_output_format_from_extension(output_file)
     
-    save_functions = {
-        'csv': save_channels_to_csv,
-        'json': save_channels_to_json,
-        'xml': save_channels_to_xml,
-        'sql': save_channels_to_sql
-    }
-    
-    if output_format not in save_functions:
+    if output_format not in SAVE_FUNCTIONS:
         print(f"❌ Unsupported output format: {output_format}")
-        print(f"Supported formats: {', '.join(save_functions.keys())}")
+        print(f"Supported formats: {', '.join(SAVE_FUNCTIONS.keys())}")
         return False
     
-    return save_functions[output_format](channels, output_file, verbose)
+    return SAVE_FUNCTIONS[output_format](channels, output_file, verbose, stats)
 
 def main():
     """Main function with argument parsing"""
@@ -468,6 +1515,7 @@ Examples:
   {sys.argv[0]} subscriptions.mhtml --output data.json --format json
   {sys.argv[0]} subscriptions.mhtml --output channels.xml
   {sys.argv[0]} subscriptions.mhtml --output database.sql --format sql
+  {sys.argv[0]} subscriptions.mhtml -o channels.csv -o data.json -o channels.sqlite
   {sys.argv[0]} subscriptions.mhtml --quality fast --verbose
   {sys.argv[0]} subscriptions.mhtml --output-dir ./exports/
 
@@ -479,21 +1527,40 @@ For more information, visit: https://github.com/abe238/youtube-subscription-extr
                        help='Path to YouTube subscriptions MHTML file')
     
     parser.add_argument('--output', '-o',
-                       default='youtube_channels.csv',
-                       help='Output filename (default: youtube_channels.csv)')
+                       action='append',
+                       help='Output filename; repeat to write several formats from one extraction (default: youtube_channels.csv)')
     
     parser.add_argument('--output-dir',
                        help='Output directory path (default: current directory)')
     
     parser.add_argument('--format', '-f',
-                       choices=['csv', 'json', 'xml', 'sql'],
-                       help='Output format (auto-detected from file extension if not specified)')
+                       choices=list(SAVE_FUNCTIONS),
+                       help='Output format for every output (auto-detected from each file extension if not specified)')
+    
+    parser.add_argument('--shard-rows',
+                       type=int,
+                       metavar='N',
+                       help=f"Split {', '.join(SHARDABLE_FORMATS)} outputs into part files of at most N rows")
+    
+    parser.add_argument('--shard-bytes',
+                       type=parse_size,
+                       metavar='SIZE',
+                       help='Split shardable outputs into part files of at most SIZE (e.g. 64MB)')
+    
+    parser.add_argument('--shard-compress',
+                       action='store_true',
+                       help='Gzip finished shards on a background thread')
     
     parser.add_argument('--quality',
                        choices=['fast', 'comprehensive'],
                        default='comprehensive',
                        help='Extraction quality mode (default: comprehensive)')
     
+    parser.add_argument('--engine',
+                       choices=sorted(SECTION_PARSERS),
+                       default='regex',
+                       help='Field extraction engine: regular expressions or a single-pass html.parser tokenizer (default: regex)')
+    
     parser.add_argument('--encoding',
                        default='utf-8',
                        help='Input file encoding (default: utf-8)')
@@ -502,12 +1569,48 @@ For more information, visit: https://github.com/abe238/youtube-subscription-extr
                        action='store_true',
                        help='Enable detailed progress output')
     
+    parser.add_argument('--extract-images',
+                       metavar='DIR',
+                       help='Decode embedded profile images into DIR and link them in each channel record')
+    
+    parser.add_argument('--stats',
+                       metavar='FILE',
+                       help='Write a JSON summary statistics report (coverage, subscriber percentiles and histogram)')
+    
+    parser.add_argument('--checkpoint',
+                       metavar='FILE',
+                       help='Periodically save extraction progress to FILE so an interrupted run can be resumed')
+    
+    parser.add_argument('--checkpoint-every',
+                       type=int,
+                       default=500,
+                       metavar='N',
+                       help='Save a checkpoint every N channel sections (default: 500)')
+    
+    parser.add_argument('--resume',
+                       action='store_true',
+                       help='Continue from the checkpoint given with --checkpoint instead of starting over')
+    
+    parser.add_argument('--memory-report',
+                       action='store_true',
+                       help='Track memory usage with tracemalloc and print a per-stage breakdown')
+    
     parser.add_argument('--version',
                        action='version',
                        version=f'YouTube Subscription Extractor {__version__}')
     
     args = parser.parse_args()
     
+    if args.shard_rows is not None and args.shard_rows <= 0:
+        parser.error('--shard-rows must be a positive integer')
+    sharding = bool(args.shard_rows or args.shard_bytes)
+    if args.shard_compress and not sharding:
+        parser.error('--shard-compress requires --shard-rows or --shard-bytes')
+    if args.resume and not args.checkpoint:
+        parser.error('--resume requires --checkpoint')
+    if args.checkpoint_every <= 0:
+        parser.error('--checkpoint-every must be a positive integer')
+    
     # Validate input file
     input_path = Path(args.input_file)
     if not input_path.exists():
@@ -519,28 +1622,46 @@ For more information, visit: https://github.com/abe238/youtube-subscription-extr
         sys.exit(1)
     
     # Handle output directory
+    outputs = args.output or ['youtube_channels.csv']
     if args.output_dir:
         output_dir = Path(args.output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
-        output_path = output_dir / args.output
+        output_paths = [output_dir / output for output in outputs]
     else:
-        output_path = Path(args.output)
+        output_paths = [Path(output) for output in outputs]
     
     # Display banner
     if args.verbose:
         print("🎯 YouTube Subscription Extractor")
         print("=" * 50)
         print(f"Input file: {input_path}")
-        print(f"Output file: {output_path}")
+        for output_path in output_paths:
+            print(f"Output file: {output_path}")
         print(f"Quality mode: {args.quality}")
+        print(f"Engine: {args.engine}")
         print("=" * 50)
     
+    memory_report = None
+    if args.memory_report:
+        import tracemalloc
+        memory_report = []
+        tracemalloc.start()
+    
+    stats = new_channel_stats()
+    
     try:
         # Extract channels
         channels = extract_youtube_channels_comprehensive(
             str(input_path), 
             quality=args.quality, 
-            verbose=args.verbose
+            verbose=args.verbose,
+            memory_report=memory_report,
+            images_dir=args.extract_images,
+            stats=stats,
+            engine=args.engine,
+            checkpoint_file=args.checkpoint,
+            resume=args.resume,
+            checkpoint_every=args.checkpoint_every
         )
         
         if not channels:
@@ -551,15 +1672,31 @@ For more information, visit: https://github.com/abe238/youtube-subscription-extr
             print("3. Try re-exporting the file with a different browser")
             sys.exit(1)
         
-        # Determine output format
-        output_format = args.format if args.format else get_output_format_from_extension(str(output_path))
+        # Fan the extracted records out to every requested writer
+        saved_paths = []
+        for output_path in output_paths:
+            output_format = args.format if args.format else get_output_format_from_extension(str(output_path))
+            if sharding and output_format in SHARDABLE_FORMATS:
+                if save_channels_sharded(channels, str(output_path), output_format, args.shard_rows,
+                                         args.shard_bytes, args.shard_compress, args.verbose, stats):
+                    saved_paths.append(shard_manifest_path(output_path))
+                continue
+            
+            if sharding:
+                print(f"⚠️ Sharding is not supported for {output_format}; writing {output_path} as a single file")
+            if save_channels(channels, str(output_path), output_format, args.verbose, stats):
+                saved_paths.append(output_path)
+        record_memory_stage(memory_report, 'save')
         
-        # Save in the specified format
-        if save_channels(channels, str(output_path), output_format, args.verbose):
+        if len(saved_paths) == len(output_paths):
+            if args.checkpoint:
+                remove_checkpoint(args.checkpoint)
+            
             # Display statistics
-            channels_with_subs = sum(1 for ch in channels if ch['SubscriberCount'])
-            channels_with_images = sum(1 for ch in channels if ch['ChannelImage'])
-            channels_with_desc = sum(1 for ch in channels if ch['ChannelDescription'])
+            metadata = build_export_metadata(stats)
+            channels_with_subs = metadata['channels_with_subscribers']
+            channels_with_images = metadata['channels_with_images']
+            channels_with_desc = metadata['channels_with_descriptions']
             
             print(f"\n🎉 Extraction completed successfully!")
             print(f"📊 Results:")
@@ -567,7 +1704,14 @@ For more information, visit: https://github.com/abe238/youtube-subscription-extr
             print(f"   With subscriber counts: {channels_with_subs} ({channels_with_subs/len(channels)*100:.1f}%)")
             print(f"   With profile images: {channels_with_images} ({channels_with_images/len(channels)*100:.1f}%)")
             print(f"   With descriptions: {channels_with_desc} ({channels_with_desc/len(channels)*100:.1f}%)")
-            print(f"📁 Output saved to: {output_path}")
+            for output_path in saved_paths:
+                print(f"📁 Output saved to: {output_path}")
+            
+            if args.stats:
+                import json
+                with open_atomic(args.stats, 'w', encoding='utf-8') as stats_file:
+                    json.dump(summarize_channel_stats(stats), stats_file, indent=2)
+                print(f"📈 Statistics report saved to: {args.stats}")
             
             # Show sample of extracted channels
             if args.verbose and len(channels) > 0:
@@ -577,6 +1721,9 @@ For more information, visit: https://github.com/abe238/youtube-subscription-extr
                 
                 if len(channels) > 3:
                     print(f"   ... and {len(channels) - 3} more")
+            
+            if memory_report is not None:
+                print_memory_report(memory_report, input_path.stat().st_size)
         
         else:
             sys.exit(1)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Build a self-contained zipapp (.pyz) of YouTube Subscription Extractor
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import zipapp
+from pathlib import Path
+
+# -I -S skip user and site-packages path scanning; env -S splits the flags onto
+# separate arguments (GNU coreutils 8.30+, macOS and the BSDs)
+DEFAULT_INTERPRETER = "/usr/bin/env -S python3 -I -S"
+
+def build_zipapp(output_path, interpreter=DEFAULT_INTERPRETER, compress=False):
+    """Package bin/extract.py into a single executable .pyz archive"""
+    script_path = Path(__file__).parent.parent / "bin" / "extract.py"
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    with tempfile.TemporaryDirectory() as staging_dir:
+        shutil.copy2(script_path, Path(staging_dir) / "extract.py")
+        zipapp.create_archive(
+            staging_dir,
+            target=str(output_path),
+            interpreter=interpreter,
+            main="extract:main",
+            compressed=compress
+        )
+    
+    return output_path
+
+def main():
+    """Build the zipapp with command line options"""
+    parser = argparse.ArgumentParser(description='Build a self-contained youtube-subscription-extractor.pyz')
+    
+    parser.add_argument('--output', '-o',
+                       default='dist/youtube-subscription-extractor.pyz',
+                       help='Output archive path (default: dist/youtube-subscription-extractor.pyz)')
+    
+    parser.add_argument('--python',
+                       default=DEFAULT_INTERPRETER,
+                       help=f"Interpreter for the archive shebang line (default: {DEFAULT_INTERPRETER}). "
+                            "Use '/usr/bin/python3 -IS' where env lacks -S")
+    
+    parser.add_argument('--compress',
+                       action='store_true',
+                       help='Compress the archive (smaller file, slightly slower startup)')
+    
+    args = parser.parse_args()
+    
+    output_path = build_zipapp(args.output, args.python, args.compress)
+    print(f"📦 Built {output_path} ({output_path.stat().st_size / 1024:.1f} KB)")
+    print(f"   Run with: {output_path} subscriptions.mhtml")
+    print(f"   or, where the shebang is not used (e.g. Windows): python3 -I -S {output_path} subscriptions.mhtml")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
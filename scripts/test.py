@@ -6,8 +6,76 @@ Installation verification script for YouTube Subscription Extractor
 import sys
 import os
 import subprocess
+import base64
+import gzip
+import hashlib
+import json
+import tempfile
+import time
+import tracemalloc
 from pathlib import Path
 
+# Peak traced memory must stay below this multiple of the input archive size
+MEMORY_LIMIT_MULTIPLE = 6
+
+# Import time budget (microseconds) for modules the extractor adds on top of a bare interpreter
+IMPORT_TIME_BUDGET_US = 60000
+
+# Modules that a plain CSV run must not import
+LAZY_MODULES = [
+    'json', 'xml.etree.ElementTree', 'xml.dom.minidom', 'sqlite3',
+    'tracemalloc', 'hashlib', 'base64'
+]
+
+def parse_importtime(stderr):
+    """Return {module: self time in microseconds} from python -X importtime output"""
+    imports = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_time, _, module = line[len("import time:"):].split("|")
+        imports[module.strip()] = int(self_time)
+    return imports
+
+def load_extract_module():
+    """Import bin/extract.py as a module, or print the error and return None"""
+    bin_dir = str(Path(__file__).parent.parent / "bin")
+    if bin_dir not in sys.path:
+        sys.path.insert(0, bin_dir)
+    
+    try:
+        import extract
+    except ImportError as e:
+        print(f"❌ Could not import extract script: {e}")
+        return None
+    return extract
+
+def generate_large_archive(path, channel_count):
+    """Write a synthetic Blink MHTML archive with the given number of channels"""
+    renderer = """<ytd-channel-renderer>
+    <div class=3D"ytd-channel-renderer">
+        <a href=3D"https://www.youtube.com/@Channel{index}">
+            <img src=3D"https://yt3.googleusercontent.com/channel{index}-s176-c-k-c0x00ffffff-no-rj-mo" alt=3D"Channel {index}">
+        </a>
+        <yt-formatted-string class=3D"style-scope ytd-channel-name">Channel {index}</yt-formatted-string>
+        <span id=3D"video-count">{index}.5K subscribers</span>
+        <yt-formatted-string id=3D"description">Generated channel number {index} used for memory regression testing.</yt-formatted-string>
+    </div>
+</ytd-channel-renderer>
+"""
+    with open(path, 'w', encoding='utf-8') as archive:
+        archive.write("From: <Saved by Blink>\n")
+        archive.write("MIME-Version: 1.0\n")
+        archive.write('Content-Type: multipart/related; type="text/html"; boundary="----MultipartBoundary--large"\n\n')
+        archive.write("------MultipartBoundary--large\n")
+        archive.write("Content-Type: text/html\n")
+        archive.write("Content-Transfer-Encoding: quoted-printable\n\n")
+        archive.write("<!DOCTYPE html><html><body>\n")
+        for index in range(channel_count):
+            archive.write(renderer.format(index=index))
+        archive.write("</body></html>\n\n")
+        archive.write("------MultipartBoundary--large--\n")
+
 def test_python_version():
     """Test if Python version is compatible"""
     print("🔍 Testing Python version...")
@@ -119,6 +187,400 @@ def test_file_structure():
             print(f"❌ Missing directories: {', '.join(missing_dirs)}")
         return False
 
+def test_memory_usage():
+    """Test that peak memory stays within a fixed multiple of the input size"""
+    print("🔍 Testing memory usage on a generated large archive...")
+    
+    extract = load_extract_module()
+    if extract is None:
+        return False
+    
+    channel_count = 20000
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        archive_path = Path(temp_dir) / "large_subscriptions.mhtml"
+        output_path = Path(temp_dir) / "large_channels.json"
+        generate_large_archive(archive_path, channel_count)
+        input_size = archive_path.stat().st_size
+        
+        memory_report = []
+        tracemalloc.start()
+        try:
+            channels = extract.extract_youtube_channels_comprehensive(
+                str(archive_path), memory_report=memory_report
+            )
+            extract.save_channels(channels, str(output_path))
+            extract.record_memory_stage(memory_report, 'save')
+        finally:
+            tracemalloc.stop()
+    
+    if len(channels) != channel_count:
+        print(f"❌ Expected {channel_count} channels, extracted {len(channels)}")
+        return False
+    
+    peak = max(entry['peak_bytes'] for entry in memory_report)
+    ratio = peak / input_size
+    worst_stage = max(memory_report, key=lambda entry: entry['peak_bytes'])['stage']
+    
+    if ratio < MEMORY_LIMIT_MULTIPLE:
+        print(f"✅ Peak memory {ratio:.1f}x input size (limit {MEMORY_LIMIT_MULTIPLE}x, worst stage: {worst_stage})")
+        return True
+    else:
+        print(f"❌ Peak memory {ratio:.1f}x input size exceeds {MEMORY_LIMIT_MULTIPLE}x (worst stage: {worst_stage})")
+        return False
+
+def test_embedded_images():
+    """Test that embedded base64 avatars are decoded once under their hash"""
+    print("🔍 Testing embedded image extraction...")
+    
+    extract = load_extract_module()
+    if extract is None:
+        return False
+    
+    image_bytes = bytes(range(256)) * 20
+    encoded = base64.encodebytes(image_bytes).decode('ascii')
+    urls = [
+        "https://yt3.googleusercontent.com/first-s176-c-k-c0x00ffffff-no-rj-mo",
+        "https://yt3.googleusercontent.com/second-s176-c-k-c0x00ffffff-no-rj-mo"
+    ]
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        archive_path = Path(temp_dir) / "embedded.mhtml"
+        images_dir = Path(temp_dir) / "images"
+        with open(archive_path, 'w', encoding='utf-8') as archive:
+            archive.write('Content-Type: multipart/related;\n\tboundary="----MultipartBoundary--images"\n\n')
+            for url in urls:
+                archive.write("------MultipartBoundary--images\n")
+                archive.write("Content-Type: image/jpeg\n")
+                archive.write("Content-Transfer-Encoding: base64\n")
+                archive.write(f"Content-Location: {url}\n\n")
+                archive.write(encoded + "\n")
+            archive.write("------MultipartBoundary--images--\n")
+        
+        image_files = extract.extract_embedded_images_from_mhtml(str(archive_path), images_dir)
+        stored = list(images_dir.iterdir())
+        expected_name = hashlib.sha256(image_bytes).hexdigest() + ".jpg"
+        
+        if (sorted(image_files) == sorted(urls) and len(stored) == 1 and
+                stored[0].name == expected_name and stored[0].read_bytes() == image_bytes):
+            print(f"✅ {len(urls)} embedded images decoded into 1 content-addressed file")
+            return True
+        else:
+            print(f"❌ Unexpected embedded image output: {[p.name for p in stored]}")
+            return False
+
+def test_summary_statistics():
+    """Test the single-pass statistics accumulator against known values"""
+    print("🔍 Testing summary statistics...")
+    
+    extract = load_extract_module()
+    if extract is None:
+        return False
+    
+    channels = [
+        {'ChannelName': f"Channel {i}", 'SubscriberCount': str(i), 'SubsCountRaw': str(i * 1000),
+         'ChannelDescription': "Description" if i % 2 else ""}
+        for i in range(1, 101)
+    ]
+    summary = extract.summarize_channel_stats(extract.compute_channel_stats(channels))
+    subscribers = summary['subscribers']
+    
+    checks = [
+        summary['total_channels'] == 100,
+        summary['field_coverage']['ChannelDescription'] == {'count': 50, 'percent': 50.0},
+        subscribers['percentiles']['p50'] == 50000,
+        subscribers['percentiles']['p90'] == 90000,
+        subscribers['histogram']['1K-10K'] == 9,
+        subscribers['histogram']['10K-100K'] == 90,
+        subscribers['histogram']['100K-1M'] == 1,
+    ]
+    
+    if all(checks):
+        print("✅ Coverage, percentiles and histogram match expected values")
+        return True
+    else:
+        print(f"❌ Unexpected statistics summary: {summary}")
+        return False
+
+CHANNEL_LINK = '<a href="https://www.youtube.com/@foo"></a>'
+
+# (case, section markup, field, expected with --engine regex, expected with --engine html).
+# An expected value of None means the engine finds no channel in the section.
+ENGINE_CASES = [
+    ("reordered attributes",
+     '<ytd-channel-renderer><a class="c" title="x" href="https://www.youtube.com/@foo"></a>'
+     '<yt-formatted-string id="text" class="style-scope ytd-channel-name">Foo Channel</yt-formatted-string>'
+     '<span class="s" id="video-count">1.5K subscribers</span></ytd-channel-renderer>',
+     'ChannelName', "Foo Channel", "Foo Channel"),
+    ("reordered description attributes",
+     '<ytd-channel-renderer>' + CHANNEL_LINK +
+     '<yt-formatted-string class="d" id="description">Reordered attributes still work.</yt-formatted-string>'
+     '</ytd-channel-renderer>',
+     'ChannelDescription', "Reordered attributes still work.", "Reordered attributes still work."),
+    ("description on a div",
+     '<ytd-channel-renderer>' + CHANNEL_LINK + '<div id="description">This is A description. ok</div></ytd-channel-renderer>',
+     'ChannelDescription', "This is A description. ok", "This is A description. ok"),
+    ("div description without a period",
+     '<ytd-channel-renderer>' + CHANNEL_LINK + '<div id="description">no period in this one at all</div></ytd-channel-renderer>',
+     'ChannelDescription', "", ""),
+    ("image on yt-img-shadow",
+     '<ytd-channel-renderer>' + CHANNEL_LINK +
+     '<yt-img-shadow src="https://yt3.googleusercontent.com/x=s176-c"></yt-img-shadow></ytd-channel-renderer>',
+     'ChannelImage', "https://yt3.googleusercontent.com/x=s176-c", "https://yt3.googleusercontent.com/x=s176-c"),
+    ("title preferred over earlier aria-label",
+     '<ytd-channel-renderer><a href="https://www.youtube.com/@foo" aria-label="Foo aria @foo">'
+     '<span title="Foo title foo"></span></a></ytd-channel-renderer>',
+     'ChannelName', "Foo title foo", "Foo title foo"),
+    ("subscribers in a data attribute",
+     '<ytd-channel-renderer>' + CHANNEL_LINK + '<div data-x="12K subscribers"></div></ytd-channel-renderer>',
+     'SubscriberCount', "12K", "12K"),
+    # Intentional differences: the html engine tokenizes markup, so it handles
+    # nested tags, uppercase tag/attribute names and single-quoted attributes
+    ("nested tags in description",
+     '<ytd-channel-renderer>' + CHANNEL_LINK +
+     '<yt-formatted-string id="description">Great <b>science</b> videos every week.</yt-formatted-string>'
+     '</ytd-channel-renderer>',
+     'ChannelDescription', "", "Great science videos every week."),
+    ("uppercase tags and attributes",
+     '<ytd-channel-renderer><A HREF="https://www.youtube.com/@foo"></A>'
+     '<YT-FORMATTED-STRING CLASS="ytd-channel-name">Foo Upper</YT-FORMATTED-STRING></ytd-channel-renderer>',
+     'ChannelName', None, "Foo Upper"),
+    ("single-quoted attributes",
+     "<ytd-channel-renderer><a href='https://www.youtube.com/@foo'></a>"
+     "<yt-formatted-string class='ytd-channel-name'>Foo Single</yt-formatted-string></ytd-channel-renderer>",
+     'ChannelName', None, "Foo Single"),
+]
+
+def test_engine_parity():
+    """Benchmark the regex and html engines and check each engine's result on edge-case markup"""
+    print("🔍 Testing extraction engine parity...")
+    
+    extract = load_extract_module()
+    if extract is None:
+        return False
+    
+    problems = []
+    for case, section, field, expected_regex, expected_html in ENGINE_CASES:
+        for engine, expected in (('regex', expected_regex), ('html', expected_html)):
+            channel_data, _ = extract.SECTION_PARSERS[engine](section, 'comprehensive')
+            actual = channel_data[field] if channel_data is not None else None
+            if actual != expected:
+                problems.append(f"{case} ({engine}): expected {expected!r}, got {actual!r}")
+    
+    sample_path = Path(__file__).parent.parent / "examples" / "sample_subscriptions.mhtml"
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        archive_path = Path(temp_dir) / "engine_corpus.mhtml"
+        generate_large_archive(archive_path, 5000)
+        
+        results = {}
+        for engine in sorted(extract.SECTION_PARSERS):
+            started = time.perf_counter()
+            channels = extract.extract_youtube_channels_comprehensive(str(archive_path), engine=engine)
+            elapsed = time.perf_counter() - started
+            sample_channels = extract.extract_youtube_channels_comprehensive(str(sample_path), engine=engine)
+            results[engine] = channels + sample_channels
+            print(f"   {engine:<6} {len(channels)} channels in {elapsed:.2f}s")
+    
+    mismatched = [engine for engine, channels in results.items() if channels != results['regex']]
+    if mismatched:
+        problems.append(f"corpus output differs from regex: {', '.join(mismatched)}")
+    
+    if not problems:
+        print(f"✅ {len(ENGINE_CASES)} edge cases match each engine's expected result; corpus output identical")
+        return True
+    else:
+        print(f"❌ Engine problems: {'; '.join(problems)}")
+        return False
+
+def test_multiple_outputs():
+    """Test that repeated --output options are all written from one extraction"""
+    print("🔍 Testing multiple output formats...")
+    
+    script_path = Path(__file__).parent.parent / "bin" / "extract.py"
+    sample_path = Path(__file__).parent.parent / "examples" / "sample_subscriptions.mhtml"
+    output_names = ["channels.csv", "channels.json", "channels.sqlite"]
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        command = [sys.executable, str(script_path), str(sample_path), "--output-dir", temp_dir]
+        for name in output_names:
+            command.extend(["--output", name])
+        
+        result = subprocess.run(command, capture_output=True, text=True, timeout=30)
+        written = sorted(path.name for path in Path(temp_dir).iterdir())
+    
+    if result.returncode == 0 and written == sorted(output_names):
+        print(f"✅ Wrote {len(output_names)} outputs with no leftover temporary files")
+        return True
+    else:
+        print(f"❌ Unexpected outputs {written}: {result.stdout}{result.stderr}")
+        return False
+
+def test_import_time():
+    """Test that startup stays within the import budget and writers are loaded lazily"""
+    print("🔍 Testing startup import time...")
+    
+    script_path = Path(__file__).parent.parent / "bin" / "extract.py"
+    sample_path = Path(__file__).parent.parent / "examples" / "sample_subscriptions.mhtml"
+    
+    def run_importtime(args):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime"] + args,
+            capture_output=True, text=True, timeout=30
+        )
+        return parse_importtime(result.stderr)
+    
+    baseline = run_importtime(["-c", "pass"])
+    startup = run_importtime([str(script_path), "--version"])
+    added_time = sum(us for module, us in startup.items() if module not in baseline)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_run = run_importtime([str(script_path), str(sample_path), "--output", str(Path(temp_dir) / "channels.csv")])
+    eager = [module for module in LAZY_MODULES if module in csv_run]
+    
+    if eager:
+        print(f"❌ CSV run imported modules that should load lazily: {', '.join(eager)}")
+        return False
+    if added_time > IMPORT_TIME_BUDGET_US:
+        print(f"❌ Startup imports took {added_time / 1000:.1f}ms (budget {IMPORT_TIME_BUDGET_US / 1000:.0f}ms)")
+        return False
+    
+    print(f"✅ Startup imports took {added_time / 1000:.1f}ms (budget {IMPORT_TIME_BUDGET_US / 1000:.0f}ms), writers load lazily")
+    return True
+
+def test_sharded_output():
+    """Test that sharded output rolls over by row count and the manifest checksums match"""
+    print("🔍 Testing sharded output...")
+    
+    extract = load_extract_module()
+    if extract is None:
+        return False
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        archive_path = Path(temp_dir) / "shard_subscriptions.mhtml"
+        output_path = Path(temp_dir) / "channels.csv"
+        generate_large_archive(archive_path, 250)
+        channels = extract.extract_youtube_channels_comprehensive(str(archive_path))
+        
+        # An earlier uncompressed export with more shards must not leave stale parts behind
+        if not extract.save_channels_sharded(channels, str(output_path), shard_rows=50):
+            print("❌ Sharded save failed")
+            return False
+        unrelated_path = Path(temp_dir) / "other.part0009.csv"
+        unrelated_path.write_text("keep me", encoding='utf-8')
+        
+        if not extract.save_channels_sharded(channels, str(output_path), shard_rows=100, compress=True):
+            print("❌ Sharded save failed")
+            return False
+        
+        manifest = json.loads(extract.shard_manifest_path(output_path).read_text(encoding='utf-8'))
+        problems = []
+        
+        part_files = sorted(path.name for path in Path(temp_dir).glob("channels.part*"))
+        if part_files != sorted(shard['file'] for shard in manifest['shards']):
+            problems.append(f"part files on disk {part_files} do not match the manifest")
+        if not unrelated_path.exists():
+            problems.append("a part file belonging to another output was removed")
+        if [shard['rows'] for shard in manifest['shards']] != [100, 100, 50]:
+            problems.append(f"unexpected shard rows {[shard['rows'] for shard in manifest['shards']]}")
+        
+        for shard in manifest['shards']:
+            shard_bytes = (Path(temp_dir) / shard['file']).read_bytes()
+            if hashlib.sha256(shard_bytes).hexdigest() != shard['sha256']:
+                problems.append(f"checksum mismatch for {shard['file']}")
+            if hashlib.sha256(gzip.decompress(shard_bytes)).hexdigest() != shard['uncompressed_sha256']:
+                problems.append(f"uncompressed checksum mismatch for {shard['file']}")
+    
+    if not problems:
+        print(f"✅ {len(manifest['shards'])} compressed shards with matching manifest checksums")
+        return True
+    else:
+        print(f"❌ Sharded output problems: {'; '.join(problems)}")
+        return False
+
+def interrupt_checkpointed_extraction(extract, archive_path, checkpoint_path, interrupt_at):
+    """Run a checkpointed extraction that is interrupted while parsing section interrupt_at"""
+    original_parser = extract.SECTION_PARSERS['regex']
+    parsed = []
+    
+    def interrupting_parser(section, quality):
+        # Simulate the process dying partway through the archive
+        if len(parsed) == interrupt_at:
+            raise KeyboardInterrupt
+        parsed.append(section)
+        return original_parser(section, quality)
+    
+    extract.SECTION_PARSERS['regex'] = interrupting_parser
+    try:
+        extract.extract_youtube_channels_comprehensive(
+            str(archive_path), checkpoint_file=str(checkpoint_path), checkpoint_every=100
+        )
+        return False
+    except KeyboardInterrupt:
+        return True
+    finally:
+        extract.SECTION_PARSERS['regex'] = original_parser
+
+def test_checkpoint_resume():
+    """Test that an interrupted checkpointed extraction resumes to the same result"""
+    print("🔍 Testing checkpoint and resume...")
+    
+    extract = load_extract_module()
+    if extract is None:
+        return False
+    
+    # (section being parsed when interrupted, sections the last checkpoint should cover);
+    # 699 is the last section before a checkpoint boundary
+    cases = [(730, 700), (699, 600)]
+    problems = []
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        archive_path = Path(temp_dir) / "checkpoint_subscriptions.mhtml"
+        generate_large_archive(archive_path, 1000)
+        expected = extract.extract_youtube_channels_comprehensive(str(archive_path))
+        
+        for interrupt_at, expected_sections in cases:
+            checkpoint_path = Path(temp_dir) / f"extract.{interrupt_at}.checkpoint.json"
+            if not interrupt_checkpointed_extraction(extract, archive_path, checkpoint_path, interrupt_at):
+                problems.append(f"interruption at section {interrupt_at} did not happen")
+                continue
+            
+            checkpoint = json.loads(checkpoint_path.read_text(encoding='utf-8'))
+            resumed = extract.extract_youtube_channels_comprehensive(
+                str(archive_path), checkpoint_file=str(checkpoint_path), resume=True, checkpoint_every=100
+            )
+            if checkpoint['sections_processed'] != expected_sections:
+                problems.append(f"interrupt at {interrupt_at} checkpointed {checkpoint['sections_processed']} sections, expected {expected_sections}")
+            if resumed != expected:
+                problems.append(f"resume after interrupt at {interrupt_at} returned {len(resumed)} of {len(expected)} channels")
+        
+        # A checkpoint whose partial output is missing or short must be ignored, not trusted
+        checkpoint_path = Path(temp_dir) / "extract.damaged.checkpoint.json"
+        partial_path = extract.checkpoint_partial_path(checkpoint_path)
+        for damage in ("missing", "short"):
+            interrupt_checkpointed_extraction(extract, archive_path, checkpoint_path, 730)
+            if damage == "missing":
+                partial_path.unlink()
+            else:
+                with open(partial_path, 'r+b') as partial_file:
+                    partial_file.truncate(partial_path.stat().st_size // 2)
+            try:
+                resumed = extract.extract_youtube_channels_comprehensive(
+                    str(archive_path), checkpoint_file=str(checkpoint_path), resume=True
+                )
+            except ValueError as e:
+                problems.append(f"resume with {damage} partial output failed: {e}")
+                continue
+            if resumed != expected:
+                problems.append(f"resume with {damage} partial output returned {len(resumed)} of {len(expected)} channels")
+    
+    if not problems:
+        print(f"✅ Resumed after {len(cases)} interruptions with identical results; damaged partial output was ignored")
+        return True
+    else:
+        print(f"❌ Checkpoint resume problems: {'; '.join(problems)}")
+        return False
+
 def main():
     """Run all tests"""
     print("🧪 YouTube Subscription Extractor - Installation Test")
@@ -129,6 +591,14 @@ def main():
         ("Import Dependencies", test_import_dependencies),
         ("File Structure", test_file_structure),
         ("Extract Script", test_extract_script),
+        ("Memory Usage", test_memory_usage),
+        ("Embedded Images", test_embedded_images),
+        ("Summary Statistics", test_summary_statistics),
+        ("Engine Parity", test_engine_parity),
+        ("Multiple Outputs", test_multiple_outputs),
+        ("Sharded Output", test_sharded_output),
+        ("Checkpoint Resume", test_checkpoint_resume),
+        ("Import Time", test_import_time),
     ]
     
     results = []